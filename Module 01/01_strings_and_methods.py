@@ -1,4 +1,7 @@
+import re
 import string
+from collections import Counter
+from functools import lru_cache
 
 # -------------------------
 # Basic literal, indexing, slicing
@@ -66,20 +69,72 @@ print(
 # -------------------------
 # Remove punctuation (simple normalization)
 # -------------------------
-def remove_punctuation(s):
+@lru_cache(maxsize=32)
+def _delete_tables(chars):
+    """Build (and remember) the translate tables that delete `chars`.
+
+    Returns (str_table, ascii_bytes_or_None). Building a table is the
+    slow part, so each set of characters is only ever done once.
+    """
+    ascii_chars = chars.encode("ascii") if chars.isascii() else None
+    return str.maketrans("", "", chars), ascii_chars
+
+
+def remove_punctuation(s, chars=string.punctuation):
     # Using str.translate is efficient and good to teach
-    tbl = str.maketrans("", "", string.punctuation)
+    tbl, ascii_chars = _delete_tables(chars)
+    if ascii_chars is not None and s.isascii():
+        # plain ASCII text: bytes.translate is several times faster still
+        return s.encode("ascii").translate(None, ascii_chars).decode("ascii")
     return s.translate(tbl)
 
 
+def normalize_many(strings, chars=string.punctuation):
+    """Remove `chars` from many strings and lowercase them.
+
+    ASCII batches are glued into one big string with newlines, cleaned
+    with a single translate() call and split again, which is much faster
+    than cleaning the strings one by one.
+    """
+    strings = list(strings)
+    tbl, ascii_chars = _delete_tables(chars)
+    blob = "\n".join(strings)
+    if (
+        strings
+        and ascii_chars is not None
+        and "\n" not in chars
+        and blob.isascii()
+        and blob.count("\n") == len(strings) - 1  # no newlines inside a string
+    ):
+        cleaned = blob.encode("ascii").translate(None, ascii_chars).lower()
+        return cleaned.decode("ascii").split("\n")
+    return [x.translate(tbl).lower() for x in strings]
+
+
 clean = remove_punctuation(text)
 print("Without punctuation:", clean)
+print("Batch normalize:", normalize_many(["Hi, there!", "WOW...", "It's me."]))
 
 
 # 1) Palindrome checker (ignore punctuation / case / spaces)
+_SKIP = frozenset(string.punctuation + " ")
+
+
 def is_palindrome(s):
-    s_clean = remove_punctuation(s).replace(" ", "").lower()
-    return s_clean == s_clean[::-1]
+    # Two pointers walk inwards from both ends: no cleaned copy, no
+    # reversed copy, and we stop at the first mismatch.
+    i, j = 0, len(s) - 1
+    while i < j:
+        if s[i] in _SKIP:
+            i += 1
+        elif s[j] in _SKIP:
+            j -= 1
+        elif s[i].lower() != s[j].lower():
+            return False
+        else:
+            i += 1
+            j -= 1
+    return True
 
 
 p = input("\nTry a palindrome (or press Enter to skip): ").strip()
@@ -91,13 +146,129 @@ name = input("Enter your full name (first middle last): ").strip()
 initials = "".join([part[0].upper() + "." for part in name.split() if part])
 print("Initials:", initials if initials else "(no name provided)")
 
+
 # 3) Word and character counts
+def normalize_word(word):
+    """Lowercase a word and strip punctuation from its ends ("Hello," -> "hello")."""
+    return word.lower().strip(string.punctuation)
+
+
+def text_stats(chunks, normalize=None):
+    """Count words, characters (not whitespace), lines and word frequencies.
+
+    `chunks` can be one string in a list or pieces of a huge file: only
+    one piece is in memory at a time. A word cut in two at a chunk edge
+    is carried over to the next chunk, so it is counted once, whole.
+    With normalize (e.g. normalize_word) each word is passed through it
+    before counting, and words that become "" (like "--") are skipped.
+    """
+    freq = Counter()
+    chars = lines = 0
+    carry = ""
+    last = "\n"
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines += chunk.count("\n")
+        # split() also decides what a word is, so both agree on what counts
+        # as whitespace (including Unicode spaces such as "\u00a0")
+        chars += sum(map(len, chunk.split()))
+        text = carry + chunk
+        words = text.split()
+        # if the text does not end in a space, its last word may go on
+        carry = words.pop() if words and not text[-1].isspace() else ""
+        if normalize:
+            words = filter(None, map(normalize, words))
+        freq.update(words)
+        last = chunk[-1]
+    if carry and normalize:
+        carry = normalize(carry)
+    if carry:
+        freq[carry] += 1
+    if last != "\n":
+        lines += 1  # last line has no newline at the end
+    return {"words": freq.total(), "chars": chars, "lines": lines, "freq": freq}
+
+
+def text_stats_file(path, chunk_size=1 << 20, normalize=None):
+    """text_stats() for a file, read chunk_size characters at a time."""
+    with open(path, encoding="utf-8") as f:
+        return text_stats(iter(lambda: f.read(chunk_size), ""), normalize)
+
+
 sentence = input("Enter a sentence to count words/chars: ").strip()
-words = sentence.split()
-print("Word count:", len(words))
-print("Character count (excluding spaces):", len(sentence.replace(" ", "")))
+stats = text_stats([sentence], normalize=normalize_word)  # "The" == "the."
+print("Word count:", stats["words"])
+print("Character count (excluding whitespace):", stats["chars"])
+print("Most common words:", stats["freq"].most_common(3))
 
 # 4) Leet-ify (small extension of replace chain)
 orig = input("Enter a word to leet-ify (a->4,e->3,o->0,i->1): ").strip()
 leet = orig.replace("a", "4").replace("e", "3").replace("o", "0").replace("i", "1")
 print("Leet:", leet)
+
+
+# Each .replace() above copies the whole string again. A substitution
+# "engine" applies every rule in ONE left-to-right pass instead.
+def _rules_pattern(rules):
+    if any(len(k) == 0 for k in rules):
+        raise ValueError("substitution keys must not be empty")
+    # longest keys first, so "ph" wins over "p" at the same position
+    keys = sorted(rules, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, keys)))
+
+
+def compile_substitutions(rules):
+    """Turn {"a": "4", "ph": "f", ...} into a function text -> new text.
+
+    Only single-character keys: one str.translate table. Any longer key:
+    one regular expression that matches all keys at once. Either way the
+    text is scanned once, and replaced text is never replaced again.
+    """
+    if all(len(k) == 1 for k in rules):
+        table = str.maketrans(rules)
+        return lambda text: text.translate(table)
+    pattern = _rules_pattern(rules)
+    return lambda text: pattern.sub(lambda m: rules[m.group()], text)
+
+
+def substitute_stream(chunks, rules):
+    """Apply rules to text that arrives in pieces (e.g. a big file).
+
+    A key could be cut in half between two chunks, so the last
+    (longest key - 1) characters are held back and glued to the next one.
+    """
+    convert = compile_substitutions(rules)
+    keep = max(map(len, rules), default=1) - 1
+    if keep == 0:  # single characters can never be split
+        yield from map(convert, chunks)
+        return
+    pattern = _rules_pattern(rules)
+    pending = ""
+    for chunk in chunks:
+        buf = pending + chunk
+        safe = len(buf) - keep  # a match starting before here is complete
+        parts, done = [], 0
+        for m in pattern.finditer(buf):
+            if m.start() >= safe:
+                break
+            parts += [buf[done : m.start()], rules[m.group()]]
+            done = m.end()
+        cut = max(safe, done)
+        parts.append(buf[done:cut])
+        pending = buf[cut:]
+        yield "".join(parts)
+    yield convert(pending)
+
+
+def substitute_file(src, dst, rules, chunk_size=1 << 16):
+    """Copy src to dst applying rules, never holding the whole file in memory."""
+    with open(src, encoding="utf-8") as fin, open(dst, "w", encoding="utf-8") as fout:
+        chunks = iter(lambda: fin.read(chunk_size), "")
+        fout.writelines(substitute_stream(chunks, rules))
+
+
+LEET_RULES = {"a": "4", "e": "3", "o": "0", "i": "1"}
+print("Leet (one pass):", compile_substitutions(LEET_RULES)(orig))
+rules = {"ph": "f", "o": "0"}
+print("Stream 'pho' + 'ne':", "".join(substitute_stream(["pho", "ne"], rules)))
@@ -1,7 +1,14 @@
+import ast
+import itertools
 import math
+import numbers
+import operator
 import random
+import time
+from collections import Counter
 from statistics import mean, median
 from fractions import Fraction
+from functools import lru_cache
 
 # -------------------------
 # Basic types: int, float, complex
@@ -96,12 +103,92 @@ def read_numbers(prompt="Enter numbers separated by space: "):
     return out
 
 
+class RunningStats:
+    """Summarize a stream of numbers in one pass with fixed memory.
+
+    count, sum, min, max, mean and variance are exact (Welford's method:
+    update the mean and the squared spread as each number arrives). The
+    median is estimated from a random sample of at most `sample_size`
+    numbers (a "reservoir"); it is exact while fewer numbers than that
+    have been seen. Two RunningStats can be merged, e.g. one per thread.
+    """
+
+    def __init__(self, sample_size=1000, seed=None):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared distances from the mean
+        self.sample_size = sample_size
+        self._sample = []
+        self._rng = random.Random(seed)
+
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if len(self._sample) < self.sample_size:
+            self._sample.append(x)
+        else:
+            # keep x with probability sample_size / count
+            j = self._rng.randrange(self.count)
+            if j < self.sample_size:
+                self._sample[j] = x
+
+    def update(self, numbers):
+        for x in numbers:
+            self.add(x)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (same as statistics.variance)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self):
+        return median(self._sample) if self._sample else None
+
+    def merge(self, other):
+        """Return a new RunningStats that summarizes both streams."""
+        out = RunningStats(self.sample_size)
+        n = self.count + other.count
+        if n == 0:
+            return out
+        delta = other.mean - self.mean
+        out.count = n
+        out.total = self.total + other.total
+        out.min = min(self.min, other.min)
+        out.max = max(self.max, other.max)
+        out.mean = self.mean + delta * other.count / n
+        out._m2 = self._m2 + other._m2 + delta**2 * self.count * other.count / n
+        # take sample values from each side in proportion to its count
+        k = min(out.sample_size, len(self._sample) + len(other._sample))
+        from_self = min(round(k * self.count / n), len(self._sample))
+        from_other = min(k - from_self, len(other._sample))
+        out._sample = out._rng.sample(self._sample, from_self) + out._rng.sample(
+            other._sample, from_other
+        )
+        return out
+
+
 nums = read_numbers("\nEnter some numbers to summarize (e.g. 1 2 3.5): ")
 if nums:
-    print("Count:", len(nums))
-    print("Sum:", sum(nums))
-    print("Mean (statistics.mean):", mean(nums))
-    print("Min, Max:", min(nums), max(nums))
+    stats = RunningStats().update(nums)  # one pass over the numbers
+    print("Count:", stats.count)
+    print("Sum:", stats.total)
+    print("Mean (one pass):", stats.mean)
+    print("Min, Max:", stats.min, stats.max)
+    print("Std dev, median:", stats.stdev, stats.median)
     # list comprehension example - convert to ints:
     ints = [int(x) for x in nums]
     print("As ints (via list comprehension):", ints)
@@ -110,15 +197,72 @@ if nums:
 # -------------------------
 # Small challenge 1: Simple calculator
 # -------------------------
+# Instead of eval() (which can run any Python code) we parse the text
+# into a syntax tree once and turn it into small nested functions that
+# only know how to do arithmetic.
+_MAX_EXPONENT = 1000
+
+
+def _safe_pow(base, exponent):
+    """base ** exponent, refusing huge powers like 9**9**9 that would run forever."""
+    if abs(exponent) > _MAX_EXPONENT and base not in (0, 1, -1):
+        raise ValueError(f"exponent too large (limit is {_MAX_EXPONENT})")
+    return base**exponent
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: _safe_pow,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _compile_node(node):
+    """Turn one syntax-tree node into a function f(variables) -> number."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env[name]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        return lambda env: op(left(env), right(env))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env: op(operand(env))
+    raise ValueError(f"not allowed in an expression: {type(node).__name__}")
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expr):
+    """Parse expr once and return a function f(variables_dict) -> number.
+
+    Results are cached by the expression text, so using the same formula
+    again skips parsing completely.
+    """
+    return _compile_node(ast.parse(expr.strip(), mode="eval").body)
+
+
+def evaluate(expr, **variables):
+    """evaluate("x * 2 + 1", x=5) -> 11"""
+    return compile_expression(expr)(variables)
+
+
 def simple_calculator():
     print(
         "\nSimple calculator: enter expression like '2 + 3' (operators + - * / ** // %)."
     )
     expr = input("Expression: ").strip()
     try:
-        # Very small, controlled eval — for beginners only
-        allowed_names = {"__builtins__": None}
-        result = eval(expr, allowed_names, {})
+        result = evaluate(expr)
         print("Result:", result)
     except Exception as e:
         print("Could not evaluate expression:", e)
@@ -126,6 +270,17 @@ def simple_calculator():
 
 simple_calculator()
 
+# One formula over many inputs: parse once, then just call the function
+formula = compile_expression("x ** 2 + 3 * x - 1")
+xs = range(20_000)
+t0 = time.perf_counter()
+slow = [eval("x ** 2 + 3 * x - 1", {"__builtins__": None}, {"x": x}) for x in xs]
+t1 = time.perf_counter()
+fast = [formula({"x": x}) for x in xs]
+t2 = time.perf_counter()
+assert slow == fast
+print(f"20k evaluations: eval {t1 - t0:.2f}s, compiled {t2 - t1:.2f}s")
+
 
 # -------------------------
 # Small challenge 2: Compound interest
@@ -146,19 +301,91 @@ except Exception as e:
     print("Skipping compound interest demo (bad input):", e)
 
 
+def compound_interest_many(
+    principals, rates, years, times_per_year=1, continuous=False
+):
+    """Compound interest for many scenarios in one call; returns a list.
+
+    Every argument may be one number or a list of numbers. A single
+    number is reused for every scenario, so you can sweep, say, 1000
+    rates for the same principal. The math uses log1p/expm1, which stay
+    accurate even for tiny rates where (1 + r/n) ** (n*t) loses digits.
+    continuous=True gives P * e**(r*t) (interest added every instant).
+    Any kind of number works (int, float, Fraction, Decimal); results are
+    floats. A rate that loses more than everything in one period
+    (1 + r/n < 0) has no real-valued answer and raises ValueError.
+    """
+    columns = [principals, rates, years, times_per_year]
+    columns = [c if isinstance(c, numbers.Number) else list(c) for c in columns]
+    sizes = {len(c) for c in columns if isinstance(c, list)}
+    if len(sizes) > 1:
+        raise ValueError(f"lists must all have the same length, got {sorted(sizes)}")
+    size = sizes.pop() if sizes else 1
+    columns = [
+        map(float, c) if isinstance(c, list) else itertools.repeat(float(c), size)
+        for c in columns
+    ]
+    expm1, log1p = math.expm1, math.log1p
+    if continuous:
+        return [p + p * expm1(r * t) for p, r, t, _ in zip(*columns)]
+    results = []
+    for p, r, t, n in zip(*columns):
+        if r / n < -1:
+            raise ValueError(f"rate {r} is below -{n} (1 + r/n < 0)")
+        if r / n == -1:
+            # everything is lost (log1p(-1) is undefined): the plain
+            # formula gives 0.0, or p itself when t == 0
+            results.append(p * 0.0 ** (n * t))
+        else:
+            results.append(p + p * expm1(n * t * log1p(r / n)))
+    return results
+
+
+# A sweep: 1000 EUR for 10 years at 1%..5%, compounded monthly vs continuously
+sweep_rates = [r / 100 for r in range(1, 6)]
+monthly = compound_interest_many(1000, sweep_rates, 10, 12)
+continuous = compound_interest_many(1000, sweep_rates, 10, continuous=True)
+for r, m, c in zip(sweep_rates, monthly, continuous):
+    print(f"rate {r:.0%}: monthly {m:.2f}, continuous {c:.2f}")
+
+
 # -------------------------
 # Small challenge 3: Roll many dice (simulation)
 # -------------------------
-def simulate_dice_rolls(n_rolls=1000):
-    totals = []
-    for _ in range(n_rolls):
-        totals.append(random.randint(1, 6) + random.randint(1, 6))
-    # quick summary
-    from collections import Counter
+def roll_histogram(n_rolls, dice=2, sides=6, seed=None, block=100_000):
+    """Roll `dice` dice n_rolls times; return counts where counts[t] is how
+    often total t came up.
 
-    counts = Counter(totals)
+    Rolls are made a block at a time with random.choices (much faster
+    than calling randint per die) and are tallied straight into the
+    counts list, so memory stays fixed however many rolls you ask for.
+    The same seed always gives the same histogram.
+    """
+    if dice < 1 or sides < 1 or block < 1:
+        raise ValueError(
+            f"dice, sides and block must be >= 1, got {dice}, {sides}, {block}"
+        )
+    rng = random.Random(seed)
+    faces = range(1, sides + 1)
+    counts = [0] * (dice * sides + 1)
+    remaining = n_rolls
+    while remaining > 0:
+        size = min(block, remaining)
+        totals = rng.choices(faces, k=size)
+        for _ in range(dice - 1):
+            totals = map(operator.add, totals, rng.choices(faces, k=size))
+        for total, c in Counter(totals).items():
+            counts[total] += c
+        remaining -= size
+    return counts
+
+
+def simulate_dice_rolls(n_rolls=1000, dice=2, sides=6, seed=None):
+    counts = roll_histogram(n_rolls, dice, sides, seed)
+    # quick summary
     print("\nDice roll simulation summary (first 10 totals counts):")
-    for total in sorted(list(counts.keys()))[:10]:
+    seen = [total for total, c in enumerate(counts) if c]
+    for total in seen[:10]:
         print(total, "->", counts[total])
 
 
@@ -173,22 +400,109 @@ except Exception as e:
 
 
 # -------------------------
-# Small challenge 4: Primality check (simple)
+# Small challenge 4: Primality check (sieve + Miller-Rabin)
 # -------------------------
+def _sieve_segment(start, stop, base_primes):
+    """Return a bytearray: flags[i] == 1 when start + i is prime."""
+    flags = bytearray([1]) * (stop - start)
+    for p in base_primes:
+        if p * p >= stop:
+            break
+        first = max(p * p, (start + p - 1) // p * p)  # first multiple to cross out
+        flags[first - start :: p] = bytes(len(range(first, stop, p)))
+    for i in range(start, min(2, stop)):  # 0 and 1 are not prime
+        flags[i - start] = 0
+    return flags
+
+
+def primes_up_to(n):
+    """Sieve of Eratosthenes: list of all primes <= n."""
+    if n < 2:
+        return []
+    flags = bytearray([1]) * (n + 1)
+    flags[0] = flags[1] = 0
+    for p in range(2, math.isqrt(n) + 1):
+        if flags[p]:
+            flags[p * p :: p] = bytes(len(range(p * p, n + 1, p)))
+    return list(itertools.compress(range(n + 1), flags))
+
+
+SMALL_PRIMES = primes_up_to(1000)  # computed once, reused below
+
+
+def primes_between(lo, hi, segment_size=1 << 16):
+    """Yield primes in [lo, hi) one segment at a time (segmented sieve).
+
+    Memory stays around segment_size bytes however wide the range is.
+    """
+    lo = max(lo, 0)
+    base = primes_up_to(math.isqrt(max(hi - 1, 0)))
+    for start in range(lo, hi, segment_size):
+        stop = min(start + segment_size, hi)
+        flags = _sieve_segment(start, stop, base)
+        yield from itertools.compress(range(start, stop), flags)
+
+
+# These bases make Miller-Rabin exact for every n < 3.3 * 10**24 (so for
+# all 64-bit integers); above that it is a very strong "probably prime".
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
 def is_prime(n):
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0:
+    """Return True if n is prime (fast even for huge n)."""
+    if n < 2:
         return False
-    r = int(math.isqrt(n))
-    for i in range(3, r + 1, 2):
-        if n % i == 0:
+    for p in SMALL_PRIMES[:25]:  # quick trial division by primes below 100
+        if n % p == 0:
+            return n == p
+    if n < 10_000:
+        return True  # no prime factor below 100 and n < 100**2
+    # Miller-Rabin: write n - 1 = d * 2**s with d odd
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
     return True
 
 
+def is_prime_many(numbers):
+    """Return a list of True/False, one per number.
+
+    A sieve first finds the primes up to sqrt(max), then crosses out
+    their multiples in the range, so its work grows with span + sqrt(max).
+    It is used only when that is small next to len(numbers) * bits, the
+    rough cost of one is_prime() test per number; large numbers in a
+    short range still get the per-number test.
+    """
+    nums = list(numbers)
+    if not nums:
+        return []
+    lo, hi = max(min(nums), 0), max(nums) + 1
+    span = hi - lo
+    root = math.isqrt(hi - 1) if hi > 1 else 0
+    sieve_work = span + root
+    if 0 < span and sieve_work <= min(10**7, len(nums) * hi.bit_length()):
+        base = primes_up_to(root)
+        flags = _sieve_segment(lo, hi, base)
+        return [n >= lo and bool(flags[n - lo]) for n in nums]
+    return [is_prime(n) for n in nums]
+
+
+print("\nPrimes below 50:", primes_up_to(49))
+print("Primes in [100, 150):", list(primes_between(100, 150)))
+print("is_prime_many([97, 98, 2**61 - 1]):", is_prime_many([97, 98, 2**61 - 1]))
+
+
 try:
     q = input("\nCheck a number for primality (blank to skip): ").strip()
     if q:
@@ -4,6 +4,8 @@ Expanded interactive examples for functions, loops, and small patterns.
 Run in a terminal (these use input()).
 """
 
+import math
+import time
 from typing import List
 
 
@@ -123,15 +125,72 @@ print("Average of", nums, "is", average(nums))
 # -------------------------
 # Simple recursion (factorial)
 # -------------------------
-def factorial(n: int) -> int:
+def factorial_recursive(n: int) -> int:
     """Simple recursive factorial. Explain base case to students."""
     if n <= 1:
         return 1
-    return n * factorial(n - 1)
+    return n * factorial_recursive(n - 1)
 
 
-print("Factorial 5:", factorial(5))
+print("Factorial 5:", factorial_recursive(5))
 # Teaching note: recursion builds a call stack. For beginners, keep depth small.
+# factorial_recursive(5000) fails with RecursionError; the version below does not.
+
+
+def _range_product(lo: int, hi: int) -> int:
+    """Return lo * (lo+1) * ... * (hi-1), splitting the range in halves.
+
+    Multiplying two similar-sized big numbers is much cheaper than growing
+    one huge number a small factor at a time. Recursion depth is only
+    about log2(hi - lo), never one call per number.
+    """
+    if hi - lo <= 16:
+        result = 1
+        for k in range(lo, hi):
+            result *= k
+        return result
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid, hi)
+
+
+_FACTORIAL_CACHE = {}  # n -> n!, the most recent few results
+_FACTORIAL_CACHE_SIZE = 32
+
+
+def factorial(n: int) -> int:
+    """Fast factorial for big n; reuses the closest smaller cached result."""
+    if n <= 1:
+        return 1
+    if n in _FACTORIAL_CACHE:
+        return _FACTORIAL_CACHE[n]
+    start = max((m for m in _FACTORIAL_CACHE if m < n), default=1)
+    result = _FACTORIAL_CACHE.get(start, 1) * _range_product(start + 1, n + 1)
+    _FACTORIAL_CACHE[n] = result
+    if len(_FACTORIAL_CACHE) > _FACTORIAL_CACHE_SIZE:
+        del _FACTORIAL_CACHE[next(iter(_FACTORIAL_CACHE))]  # drop the oldest
+    return result
+
+
+def factorial_loop(n: int) -> int:
+    """Plain left-to-right loop, for comparison."""
+    result = 1
+    for k in range(2, n + 1):
+        result *= k
+    return result
+
+
+print("\nTiming (seconds): n, simple loop, fast factorial, math.factorial")
+for size in (10, 1_000, 20_000):
+    t0 = time.perf_counter()
+    a = factorial_loop(size)
+    t1 = time.perf_counter()
+    _FACTORIAL_CACHE.clear()  # time a cold start, not a cache hit
+    b = factorial(size)
+    t2 = time.perf_counter()
+    c = math.factorial(size)
+    t3 = time.perf_counter()
+    assert a == b == c
+    print(f"{size:>6}: {t1 - t0:.4f}  {t2 - t1:.4f}  {t3 - t2:.4f}")
 
 
 # -------------------------
@@ -1,4 +1,7 @@
 import math
+import random
+import time
+from functools import lru_cache
 
 
 # -------------------------
@@ -84,10 +87,53 @@ if target is not None:
 
 
 # -------------------------
-# Factor finder (efficient up to sqrt(n))
+# Prime test (trial division by small primes + Miller-Rabin)
 # -------------------------
-def factors(n):
-    """Return sorted list of factors of n."""
+SMALL_PRIMES = [p for p in range(2, 100) if all(p % d for d in range(2, p))]
+
+
+def is_prime(n):
+    """Return True if n is prime.
+
+    Same test as is_prime() in numbers_and_math.py (each lesson runs on
+    its own, so it is repeated here). Bases 2..41 make Miller-Rabin exact
+    for every n < 3.3 * 10**24, which covers all 64-bit integers.
+    """
+    if n <= 1:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < 100 * 100:
+        return True  # no prime factor below 100, so n must be prime
+    # Miller-Rabin: write n - 1 = d * 2**s with d odd, then test each base
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False  # a proves n is composite
+    return True
+
+
+q = read_int("\nCheck primality for a number (blank to skip): ", default=None)
+if q is not None:
+    print(f"{q} is prime? {is_prime(q)}")
+
+
+# -------------------------
+# Factor finder
+# -------------------------
+def factors_simple(n):
+    """Return sorted list of factors of n (try every k up to sqrt(n))."""
     if n <= 0:
         return []
     small = []
@@ -102,34 +148,92 @@ def factors(n):
     return sorted(small + large)
 
 
+def _pollard_brent(n):
+    """Return a non-trivial factor of the odd composite n.
+
+    Pollard's rho walks x -> x*x + c (mod n) and looks for a repeat modulo
+    a hidden factor; Brent's version checks gcd() on batches of steps.
+    """
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:  # batch overshot: redo it one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        # unlucky c: try again with new random numbers
+
+
+@lru_cache(maxsize=1024)
+def prime_factorization(n):
+    """Return ((prime, exponent), ...), e.g. 360 -> ((2, 3), (3, 2), (5, 1))."""
+    if n < 1:
+        raise ValueError(f"prime_factorization needs a positive integer, got {n}")
+    counts = {}
+    for p in SMALL_PRIMES:  # cheap: strip the small factors first
+        while n % p == 0:
+            counts[p] = counts.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:  # split what is left until only primes remain
+        m = stack.pop()
+        if is_prime(m):
+            counts[m] = counts.get(m, 0) + 1
+        else:
+            d = _pollard_brent(m)
+            stack += [d, m // d]
+    return tuple(sorted(counts.items()))
+
+
+def factors(n):
+    """Return sorted list of factors of n, built from its prime factors."""
+    if n <= 0:
+        return []
+    divisors = [1]
+    for p, e in prime_factorization(n):
+        divisors = [d * p**k for d in divisors for k in range(e + 1)]
+    return sorted(divisors)
+
+
+def factors_many(numbers):
+    """Factor a batch of numbers (repeats come straight from the cache)."""
+    return [factors(n) for n in numbers]
+
+
 n = read_int(
     "\nEnter a positive integer to find its factors (or blank to skip): ", default=None
 )
-if n:
+if n is not None and n > 0:
     print(f"Factors of {n}:", factors(n))
+    print("Prime factorization:", prime_factorization(n))
+elif n is not None:
+    print("Please enter a positive integer.")
 
-
-# -------------------------
-# Prime test (simple, efficient)
-# -------------------------
-def is_prime(n):
-    """Return True if n is probably prime (deterministic for n < 2^64 with this simple test)."""
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0:
-        return False
-    r = int(math.isqrt(n))
-    for i in range(3, r + 1, 2):
-        if n % i == 0:
-            return False
-    return True
-
-
-q = read_int("\nCheck primality for a number (blank to skip): ", default=None)
-if q is not None:
-    print(f"{q} is prime? {is_prime(q)}")
+# Compare: the sqrt loop needs ~10**6 steps for a 12-digit number
+big = 600851475143
+t0 = time.perf_counter()
+slow = factors_simple(big)
+t1 = time.perf_counter()
+fast = factors(big)
+t2 = time.perf_counter()
+assert slow == fast
+print(f"factors({big}): simple {t1 - t0:.3f}s, fast {t2 - t1:.5f}s")
 
 
 # -------------------------
@@ -149,6 +253,71 @@ if a is not None:
     print(f"gcd({a}, {b}) =", gcd(a, b))
 
 
+# Working on whole sequences. math.gcd does the same job as our loop
+# above, but in C (and with a faster method for huge numbers).
+def gcd_many(numbers):
+    """gcd of a whole sequence; stops as soon as the answer is 1."""
+    result = 0  # gcd(0, x) == x, so 0 is a safe start
+    for x in numbers:
+        result = math.gcd(result, x)
+        if result == 1:
+            break  # nothing can make it smaller
+    return result
+
+
+def lcm_many(numbers):
+    """lcm of a whole sequence (0 if any number is 0)."""
+    return math.lcm(*numbers)
+
+
+def gcd_pairs(xs, ys):
+    """[gcd(xs[0], ys[0]), gcd(xs[1], ys[1]), ...]"""
+    return list(map(math.gcd, xs, ys))
+
+
+def batch_gcd(numbers):
+    """For each number, return its gcd with the product of all the others.
+
+    A result > 1 means that number shares a factor with another one.
+    Checking every pair would take n*n gcds; Bernstein's method multiplies
+    the numbers up a "product tree", then walks back down taking
+    remainders, which is far faster for thousands of big numbers.
+    """
+    numbers = list(numbers)
+    if len(numbers) < 2:
+        return [1] * len(numbers)
+    if 0 in numbers:
+        # gcd(x, 0) = x: with a 0 among the others, x shares all of itself.
+        # The 0 gets gcd(0, P) = P, the product of the rest (0 if another 0).
+        rest = [x for x in numbers if x]
+        zero_gets = abs(math.prod(rest)) if len(rest) == len(numbers) - 1 else 0
+        return [abs(x) or zero_gets for x in numbers]
+    tree = [numbers]  # bottom level: the numbers; top level: their product
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([math.prod(level[i : i + 2]) for i in range(0, len(level), 2)])
+    rems = tree.pop()
+    while tree:  # walk down: remainder of the parent modulo each child squared
+        level = tree.pop()
+        rems = [rems[i // 2] % (x * x) for i, x in enumerate(level)]
+    return [math.gcd(r // x, x) for r, x in zip(rems, numbers)]
+
+
+print("gcd_many([84, 126, 210]) =", gcd_many([84, 126, 210]))
+print("lcm_many([4, 6, 10]) =", lcm_many([4, 6, 10]))
+print("gcd_pairs([12, 35], [18, 14]) =", gcd_pairs([12, 35], [18, 14]))
+print("batch_gcd([15, 77, 221, 35]) =", batch_gcd([15, 77, 221, 35]))
+
+pairs = [(random.getrandbits(64), random.getrandbits(64)) for _ in range(50_000)]
+t0 = time.perf_counter()
+slow = [gcd(x, y) for x, y in pairs]
+t1 = time.perf_counter()
+fast = gcd_pairs(*zip(*pairs))
+t2 = time.perf_counter()
+assert slow == fast
+print(f"50k gcds: Euclid loop {t1 - t0:.3f}s, math.gcd {t2 - t1:.3f}s")
+
+
 def is_leap_year(year):
     """Return True for Gregorian leap years."""
     return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
@@ -159,4 +328,45 @@ if year is not None:
     print(f"{year} is a leap year? {is_leap_year(year)}")
 
 
+# The Gregorian calendar repeats exactly every 400 years, so we can work
+# out the leap flags for one cycle once and look every year up in it.
+LEAP_CYCLE = bytes(is_leap_year(y) for y in range(400))  # 1 = leap year
+
+
+def is_leap_year_many(years):
+    """[True/False for each year] using the 400-year table (no % 4/100/400)."""
+    return [LEAP_CYCLE[y % 400] == 1 for y in years]
+
+
+def days_in_year_many(years):
+    return [365 + LEAP_CYCLE[y % 400] for y in years]
+
+
+def _leaps_before(year):
+    # leap years in 1..year-1; the floor divisions also work for year <= 0
+    y = year - 1
+    return y // 4 - y // 100 + y // 400
+
+
+def count_leap_years(start, stop):
+    """Number of leap years in start <= year < stop, without looping."""
+    return _leaps_before(stop) - _leaps_before(start)
+
+
+def days_before_year(year):
+    """Days from 1 January of year 1 to 1 January of `year`."""
+    return 365 * (year - 1) + _leaps_before(year)
+
+
+def days_before_year_many(years):
+    """Day offset of 1 January for each year (handy for bucketing dates)."""
+    return [days_before_year(y) for y in years]
+
+
+print("\nLeap flags 1900, 2000, 2024:", is_leap_year_many([1900, 2000, 2024]))
+print("Days in 2023, 2024:", days_in_year_many([2023, 2024]))
+print("Leap years from 1900 up to (not incl.) 2025:", count_leap_years(1900, 2025))
+print("Days before 2024-01-01 since 0001-01-01:", days_before_year(2024))
+
+
 print("\nEnd of conditional logic & control flow demo.")
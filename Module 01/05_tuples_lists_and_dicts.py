@@ -1,5 +1,18 @@
+import hashlib
+import heapq
+import marshal
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from copy import deepcopy
-from collections import Counter
+from collections import Counter, OrderedDict
+from itertools import islice
+from operator import add, itemgetter
 
 # -------------------------
 # Tuples (immutable)
@@ -62,6 +75,56 @@ print("original:", a)
 print("shallow copy (shares nested lists):", shallow)
 print("deep copy (independent):", deep)
 
+
+# deepcopy works for any object, but that makes it slow: it looks up how
+# to copy every single object and remembers each one in a "memo" dict.
+# For plain JSON-like data (dict, list, tuple, str, int, float, bool,
+# None) marshal - the format behind .pyc files - does the same job in C.
+def fast_copy(data):
+    """Deep copy of JSON-like data; raises ValueError for other objects."""
+    return marshal.loads(marshal.dumps(data))
+
+
+# Often you do not need a copy at all. If you never change data in
+# place, an old version can simply be kept as a snapshot, and a new
+# version only copies the containers on the path to what changed.
+def assoc_in(data, path, value):
+    """Return a new version of `data` with data[path[0]][path[1]]... = value.
+
+    Only the dicts/lists/tuples along `path` are copied; every other
+    branch is shared with the old version, which stays unchanged. Each of
+    those containers is copied in full, so an update costs the total size
+    of the containers on the path (not just its depth): cheap for nested
+    configs, slow for one huge flat list.
+    """
+    if not path:
+        return value
+    key, rest = path[0], path[1:]
+    if isinstance(data, dict):
+        new = dict(data)
+        new[key] = assoc_in(data.get(key, {}), rest, value)
+        return new
+    new = list(data)
+    new[key] = assoc_in(data[key], rest, value)
+    return tuple(new) if isinstance(data, tuple) else new
+
+
+config = {
+    "users": [{"id": i, "tags": ["a", "b"], "meta": {"x": 1.5}} for i in range(500)],
+    "ui": {"theme": "dark", "font": {"size": 12}},
+}
+t0 = time.perf_counter()
+copy1 = deepcopy(config)
+t1 = time.perf_counter()
+copy2 = fast_copy(config)
+t2 = time.perf_counter()
+assert copy1 == copy2 == config
+print(f"deepcopy {1000 * (t1 - t0):.2f} ms, fast_copy {1000 * (t2 - t1):.2f} ms")
+
+v2 = assoc_in(config, ["ui", "font", "size"], 14)  # snapshot: config itself
+print("old font size:", config["ui"]["font"]["size"], "new:", v2["ui"]["font"]["size"])
+print("users list shared, not copied?", v2["users"] is config["users"])
+
 # -------------------------
 # enumerate, range, zip (indexed loops and parallel iteration)
 # -------------------------
@@ -117,6 +180,82 @@ print(
     sorted(scores.items(), key=lambda kv: kv[1], reverse=True),
 )
 
+
+# Sorting again for every question is wasteful when scores change a
+# little at a time (think of a live leaderboard). Keep them sorted instead.
+class RankedScores:
+    """A name -> score mapping that always stays ordered by score.
+
+    Next to a normal dict we keep a sorted list of (-score, name) pairs,
+    so the best score comes first (ties: alphabetical by name). bisect
+    finds any position in O(log n); inserting or removing at that spot
+    only shifts the list in memory, which is very fast.
+    """
+
+    def __init__(self, scores=None):
+        self._scores = {}
+        self._order = []  # sorted list of (-score, name)
+        for name, score in (scores or {}).items():
+            self[name] = score
+
+    def __setitem__(self, name, score):
+        if name in self._scores:
+            self._remove(name)
+        self._scores[name] = score
+        insort(self._order, (-score, name))
+
+    def _remove(self, name):
+        i = bisect_left(self._order, (-self._scores[name], name))
+        del self._order[i]
+
+    def __delitem__(self, name):
+        self._remove(name)
+        del self._scores[name]
+
+    def __getitem__(self, name):
+        return self._scores[name]
+
+    def __contains__(self, name):
+        return name in self._scores
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __iter__(self):
+        """Names, best score first (so list(board) is the ranking)."""
+        return (name for _, name in self._order)
+
+    def keys(self):  # lets dict(board) copy the scores
+        return list(self)
+
+    def items(self):
+        """(name, score) pairs, best first."""
+        return [(name, -neg) for neg, name in self._order]
+
+    def top(self, k):
+        """The k best (name, score) pairs, best first."""
+        return [(name, -neg) for neg, name in self._order[:k]]
+
+    def rank(self, name):
+        """1 for the best score, 2 for the next, ..."""
+        return bisect_left(self._order, (-self._scores[name], name)) + 1
+
+    def between(self, low, high):
+        """All (name, score) with low <= score <= high, best first."""
+        first = bisect_left(self._order, -high, key=itemgetter(0))
+        last = bisect_right(self._order, -low, key=itemgetter(0))
+        return [(name, -neg) for neg, name in self._order[first:last]]
+
+
+board = RankedScores(scores)
+print("Leaderboard top 2:", board.top(2))
+board["Bob"] = 95  # update: no full re-sort needed
+board["Dana"] = 80
+print("After updates:", board.top(4))
+print("Rank of Cathy:", board.rank("Cathy"))
+print("Scores between 80 and 90:", board.between(80, 90))
+print("Ranking:", list(board), "as dict:", dict(board))
+
 # -------------------------
 # Counting words (using Counter) - improved from manual tally
 # -------------------------
@@ -131,26 +270,168 @@ print("Top 3 words:", most_common)
 # -------------------------
 # Small helper functions / challenges
 # -------------------------
+def iter_flatten(nested):
+    """Yield the items of nested iterables one by one, at any depth.
+
+    Lists, tuples, ranges, sets, generators... are all opened up. Nothing
+    is copied up front: items come out as you ask for them. An explicit
+    stack of iterators replaces recursion, so even 100000 levels of
+    nesting are fine. Strings and bytes stay whole (they are not split).
+    """
+    stack = [iter(nested)]
+    while stack:
+        for item in stack[-1]:
+            if not isinstance(item, (str, bytes, bytearray)):
+                try:
+                    stack.append(iter(item))  # go one level deeper
+                    break
+                except TypeError:
+                    pass  # not iterable: a plain item
+            yield item
+        else:
+            stack.pop()  # this level is used up, go back to the parent
+
+
+def chunked(iterable, size, typecode=None):
+    """Yield lists of `size` items (the last one may be shorter).
+
+    With a typecode such as "q" (ints) or "d" (floats) each chunk is a
+    compact array instead of a list.
+    """
+    it = iter(iterable)
+    while block := list(islice(it, size)):
+        yield array(typecode, block) if typecode else block
+
+
 def flatten(list_of_lists):
-    """Return a flattened list from a list of lists."""
-    return [item for row in list_of_lists for item in row]
+    """Return a flattened list from nested iterables (any depth)."""
+    return list(iter_flatten(list_of_lists))
+
+
+def iter_unique(seq, window=None):
+    """Yield each item the first time it is seen.
+
+    window=None (exact): remembers every item, so memory grows with the
+    number of distinct items. window=N: remembers only the N most
+    recently seen items (an LRU), so memory is fixed, but an item that
+    comes back after being forgotten is yielded again.
+    """
+    if window is None:
+        seen = set()
+        for x in seq:
+            if x not in seen:
+                seen.add(x)
+                yield x
+        return
+    recent = OrderedDict()
+    for x in seq:
+        if x in recent:
+            recent.move_to_end(x)  # seen again: now the most recent
+        else:
+            recent[x] = None
+            if len(recent) > window:
+                recent.popitem(last=False)  # forget the oldest
+            yield x
 
 
 def unique_preserve_order(seq):
     """Return list of unique items preserving first-seen order."""
-    seen = set()
-    out = []
+    return list(iter_unique(seq))
+
+
+def _key_text(key, item):
+    """Return key(item), making sure it is a str (used to store or hash items)."""
+    text = key(item)
+    if not isinstance(text, str):
+        raise TypeError(f"key must return a str, not {type(text).__name__}")
+    return text
+
+
+class BloomFilter:
+    """A set that stores only a few bits per item, never the items.
+
+    `x in bf` is always True for items that were added, but may also be
+    True for an item that never was (a "false positive"), in about
+    `error_rate` of the cases once `capacity` items are in.
+
+    Items are hashed by key(item), which must return a str. The default,
+    repr, is right for numbers, strings and tuples of them, but unlike a
+    set it tells 1, 1.0 and True apart. For other objects pass a key that
+    gives equal items the same text (e.g. json.dumps with sort_keys=True).
+    """
+
+    def __init__(self, capacity, error_rate=0.01, key=repr):
+        ln2 = math.log(2)
+        self.key = key
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / ln2**2))
+        self.hashes = max(1, round(self.size / capacity * ln2))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        text = _key_text(self.key, item)
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add item; return True if it was (probably) not there before."""
+        new = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] >> bit & 1:
+                self._bits[byte] |= 1 << bit
+                new = True
+        return new
+
+    def __contains__(self, item):
+        return all(
+            self._bits[pos // 8] >> (pos % 8) & 1 for pos in self._positions(item)
+        )
+
+
+def iter_unique_bloom(seq, capacity, error_rate=0.01, key=repr):
+    """Approximate dedup in fixed memory: a new item is wrongly skipped
+    about `error_rate` of the time, a repeat is never yielded twice.
+    Items count as repeats when key(item) matches (see BloomFilter)."""
+    bf = BloomFilter(capacity, error_rate, key)
     for x in seq:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out
+        if bf.add(x):
+            yield x
+
+
+def iter_unique_on_disk(seq, key=repr):
+    """Dedup for more distinct items than fit in memory.
+
+    Seen items are kept in a temporary SQLite database on disk, which is
+    deleted when the loop finishes. Two items are the same when key(item)
+    gives the same str, so the result is exact for that key, not for ==:
+    with the default repr, [1, 1.0, True] keeps all three (a set keeps 1).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = sqlite3.connect(os.path.join(tmp, "seen.db"))
+        try:
+            db.execute("PRAGMA journal_mode = OFF")  # scratch data: no journal
+            db.execute("CREATE TABLE seen (key TEXT PRIMARY KEY)")
+            for x in seq:
+                k = _key_text(key, x)
+                cur = db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (k,))
+                if cur.rowcount:  # 1 row inserted -> first time we see x
+                    yield x
+        finally:
+            db.close()
 
 
 # Try flatten
 nested = [[1, 2], [3, 4], [5, 6]]
 print("\nFlatten nested:", flatten(nested))
 print("Unique preserve order from [2,1,2,3,1]:", unique_preserve_order([2, 1, 2, 3, 1]))
+stream = [1, 2, 1, 3, 4, 5, 1]
+print("Unique, remembering only 3 items:", list(iter_unique(stream, window=3)))
+print("Unique (Bloom filter):", list(iter_unique_bloom(stream, capacity=100)))
+print("Unique (on disk):", list(iter_unique_on_disk(stream)))
+words_in = ["Hi", "hi", "Yo"]
+print("Unique, ignoring case:", list(iter_unique_on_disk(words_in, key=str.lower)))
 
 # Challenge: top-k words from text (use counts above)
 k = input("\nEnter k to show top-k words (or press Enter to skip): ").strip()
@@ -158,11 +439,155 @@ if k.isdigit():
     k = int(k)
     print(f"Top {k} words:", counts.most_common(k))
 
+
+# Challenge: top-k when there are too many different words for a Counter
+class SpaceSaving:
+    """Approximate top-k counter that never holds more than `capacity` words.
+
+    When the table is full, a new word replaces the word with the lowest
+    count and takes over that count (+1). Any word that makes up more
+    than 1/capacity of the stream is guaranteed to be in the table, and
+    no count is more than n/capacity too high.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.n = 0  # total number of items seen
+        # min-heap of [count, tick, item], one entry per word. Counts only
+        # grow, so an entry may be out of date (too low); it is fixed
+        # lazily when it reaches the top. `tick` breaks ties without
+        # comparing the words themselves.
+        self._heap = []
+        self._tick = 0
+
+    def _push(self, item):
+        self._tick += 1
+        heapq.heappush(self._heap, [self.counts[item], self._tick, item])
+
+    def _pop_smallest(self):
+        """Remove and return the word with the lowest count (O(log capacity))."""
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts[item] == count:
+                return item
+            self._push(item)  # out of date: put it back with its real count
+
+    def add(self, item, count=1):
+        self.n += count
+        if item in self.counts:
+            self.counts[item] += count  # its heap entry is fixed later
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self._push(item)
+        else:
+            smallest = self._pop_smallest()
+            self.counts[item] = self.counts.pop(smallest) + count
+            self._push(item)
+
+    def update(self, items):
+        for x in items:
+            self.add(x)
+        return self
+
+    def most_common(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+
+    def _floor(self):
+        # a word missing from a full table may still have been seen up to
+        # (smallest count) times; a table that is not full missed nothing
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """Combine two summaries (e.g. from two processes) into a new one.
+
+        A word missing from one table is given that table's floor count,
+        which keeps the "more than n/capacity is always kept" guarantee.
+        """
+        out = SpaceSaving(self.capacity)
+        out.n = self.n + other.n
+        floor_a, floor_b = self._floor(), other._floor()
+        both = {
+            item: self.counts.get(item, floor_a) + other.counts.get(item, floor_b)
+            for item in self.counts.keys() | other.counts.keys()
+        }
+        out.counts = dict(
+            heapq.nlargest(self.capacity, both.items(), key=lambda kv: kv[1])
+        )
+        for item in out.counts:
+            out._push(item)
+        return out
+
+
+class CountMinSketch:
+    """Estimate how often any item appeared, using a fixed-size table.
+
+    Estimates are never too low; with probability 1 - delta they are at
+    most eps * n too high (n = number of items added). Sketches with the
+    same eps/delta can be merged by adding their tables.
+    """
+
+    def __init__(self, eps=0.001, delta=0.01):
+        self.width = math.ceil(math.e / eps)
+        self.depth = min(16, math.ceil(math.log(1 / delta)))
+        self.rows = [array("q", [0]) * self.width for _ in range(self.depth)]
+        self.n = 0
+
+    def _columns(self, item):
+        # one hash, cut into `depth` 4-byte numbers: one column per row
+        raw = hashlib.blake2b(repr(item).encode(), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(raw[i : i + 4], "little") % self.width
+            for i in range(0, len(raw), 4)
+        ]
+
+    def add(self, item, count=1):
+        self.n += count
+        for row, col in zip(self.rows, self._columns(item)):
+            row[col] += count
+
+    def update(self, items):
+        for x in items:
+            self.add(x)
+        return self
+
+    def estimate(self, item):
+        return min(row[col] for row, col in zip(self.rows, self._columns(item)))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("can only merge sketches with the same eps and delta")
+        out = CountMinSketch.__new__(CountMinSketch)
+        out.width, out.depth, out.n = self.width, self.depth, self.n + other.n
+        out.rows = [array("q", map(add, a, b)) for a, b in zip(self.rows, other.rows)]
+        return out
+
+
+# Accuracy check on a big, skewed stream of 5000 different "words"
+vocab = [f"w{i}" for i in range(5000)]
+stream = random.choices(vocab, weights=[1 / (i + 1) for i in range(5000)], k=50_000)
+exact = Counter(stream)
+ss = SpaceSaving(capacity=200).update(stream)
+cms = CountMinSketch(eps=0.001, delta=0.01).update(stream)
+print("\nExact top 5:      ", exact.most_common(5))
+print("SpaceSaving top 5:", ss.most_common(5))
+print("Count-Min estimate for w0:", cms.estimate("w0"), "exact:", exact["w0"])
+print(f"Counters kept: exact {len(exact)}, SpaceSaving {len(ss.counts)}")
+
 # Challenge: flatten & dedupe a list of lists then sort
 lst_of_lsts = [[3, 1], [2, 3], [4]]
 flat = flatten(lst_of_lsts)
 print("Flattened:", flat)
 print("Unique sorted:", sorted(set(flat)))
+# Same result without building the flat list: the set pulls items lazily
+print("Unique sorted (lazy):", sorted(set(iter_flatten(lst_of_lsts))))
+
+deep = [1, [2, [3, [4, [5, (6, 7)]]]], "text"]
+print("Deep flatten:", flatten(deep))
+print("In chunks of 3:", list(chunked(iter_flatten(deep), 3)))
+print("Numeric chunks:", list(chunked(iter_flatten([[1, 2], [3, [4, 5]]]), 2, "q")))
 
 
 print("\nEnd of tuples, lists & dicts demo. Next: oop.py")
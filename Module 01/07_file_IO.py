@@ -1,7 +1,16 @@
 import csv
+import heapq
+import itertools
 import json
+import mmap
+import pickle
+import tempfile
+from array import array
 from pathlib import Path
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # -----------------------------------------------------------
 # 1) Simple text write / read (original example, with notes)
@@ -9,13 +18,75 @@ import os
 BASE = Path(".")  # current folder (use pathlib for clarity)
 
 
+class LineWriter:
+    """Collect lines in memory and write them to disk in big batches.
+
+    The buffer is flushed when it reaches max_bytes, or on the next
+    write() once max_seconds have passed since the last flush. There is
+    no timer: lines written last wait in memory until another write,
+    flush() or close(). With fsync=True every flush is also forced onto
+    the disk (slower, but survives a crash or power cut). Use it with
+    `with` so the last lines are flushed on exit.
+    """
+
+    def __init__(
+        self, path, mode="a", max_bytes=64 * 1024, max_seconds=1.0, fsync=False
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.fsync = fsync
+        self.count = 0  # lines written so far
+        self._buf = bytearray()
+        self._f = self.path.open(mode + "b")  # binary: we encode ourselves
+        self._last_flush = time.monotonic()
+
+    def write(self, line: str):
+        self._buf += line.encode("utf-8")
+        self._buf += b"\n"
+        self.count += 1
+        self._maybe_flush()
+
+    def writelines(self, lines):
+        """Add many lines at once (one join + one encode for the batch)."""
+        lines = list(lines)
+        if lines:
+            self._buf += ("\n".join(lines) + "\n").encode("utf-8")
+            self.count += len(lines)
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        too_big = len(self._buf) >= self.max_bytes
+        too_old = time.monotonic() - self._last_flush >= self.max_seconds
+        if too_big or too_old:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._f.write(self._buf)
+            self._buf.clear()
+        self._f.flush()
+        if self.fsync:
+            os.fsync(self._f.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def write_lines(path: Path, lines):
     """Write a list of lines to a text file (overwrites)."""
     path = Path(path)
-    with path.open("w", encoding="utf-8") as f:
-        for L in lines:
-            f.write(L + "\n")  # add newline explicitly
-    print(f"Wrote {len(lines)} lines to {path}")
+    with LineWriter(path, "w") as w:
+        w.writelines(lines)
+    print(f"Wrote {w.count} lines to {path}")
 
 
 def read_whole_file(path: Path) -> str:
@@ -35,8 +106,8 @@ print("File contents:\n", contents)
 # 2) Appending vs writing and safe exists check
 # -----------------------------------------------------------
 def append_line(path: Path, line: str):
-    with Path(path).open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    with LineWriter(path, "a") as w:
+        w.write(line)
     print(f"Appended line to {path}")
 
 
@@ -44,6 +115,23 @@ if not BASE.joinpath("example.txt").exists():
     write_lines("example.txt", ["Created because file was missing"])
 append_line("example.txt", "Appended line")
 
+# Why batching matters: opening the file for every line vs one LineWriter.
+# The log goes in a temporary folder that is removed afterwards.
+N = 5000
+with tempfile.TemporaryDirectory() as tmp_dir:
+    log_path = Path(tmp_dir) / "log_demo.txt"
+    t0 = time.perf_counter()
+    for i in range(N):
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(f"log line {i}\n")
+    t1 = time.perf_counter()
+    with LineWriter(log_path, "a") as w:
+        for i in range(N):
+            w.write(f"log line {i}")
+    t2 = time.perf_counter()
+print(f"open per line: {N / (t1 - t0):,.0f} lines/s")
+print(f"LineWriter:    {N / (t2 - t1):,.0f} lines/s")
+
 
 # -----------------------------------------------------------
 # 3) Read file line-by-line (memory friendly)
@@ -59,6 +147,73 @@ print("\nReading example.txt line-by-line:")
 for ln in read_lines_iter("example.txt"):
     print(">", ln)
 
+
+# -----------------------------------------------------------
+# 3b) Very large files: bytes lines via mmap + jump to line N
+# -----------------------------------------------------------
+def iter_lines_mmap(path: Path, decode=False):
+    """Yield lines as bytes straight from a memory-mapped file.
+
+    No text decoding happens unless decode=True, which makes grepping
+    huge logs much faster (search with bytes, e.g. b"ERROR" in line).
+    """
+    path = Path(path)
+    if path.stat().st_size == 0:
+        return  # mmap cannot map an empty file
+    with path.open("rb") as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with m:
+        start = 0
+        end = len(m)
+        while start < end:
+            nl = m.find(b"\n", start)
+            stop = end if nl == -1 else nl
+            line = m[start:stop]
+            yield line.decode("utf-8") if decode else line
+            start = stop + 1
+
+
+def line_index(path: Path):
+    """Return an array of byte offsets where each line starts.
+
+    The index is cached in a sidecar file (<name>.idx) that starts with
+    the text file's (mtime_ns, size) stamp. It is reused only while that
+    stamp matches exactly, so an edited or swapped file gets a new index.
+    """
+    path = Path(path)
+    idx_path = path.with_name(path.name + ".idx")
+    st = path.stat()
+    stamp = array("q", [st.st_mtime_ns, st.st_size])
+    try:
+        cached = array("q", idx_path.read_bytes())
+        if cached[:2] == stamp:
+            return cached[2:]
+    except (FileNotFoundError, ValueError):
+        pass  # no index yet, or a damaged one: build a fresh index
+    offsets = array("q")
+    pos = 0
+    with path.open("rb") as f:
+        for ln in f:
+            offsets.append(pos)
+            pos += len(ln)
+    tmp = idx_path.with_name(idx_path.name + ".tmp")
+    tmp.write_bytes((stamp + offsets).tobytes())
+    os.replace(tmp, idx_path)  # never leave a half-written index behind
+    return offsets
+
+
+def read_line_at(path: Path, n, offsets=None):
+    """Return line number n (0-based) by seeking instead of scanning."""
+    if offsets is None:
+        offsets = line_index(path)
+    with Path(path).open("rb") as f:
+        f.seek(offsets[n])
+        return f.readline().rstrip(b"\n").decode("utf-8")
+
+
+print("\nmmap lines (bytes):", list(iter_lines_mmap("example.txt"))[:2])
+print("Line 1 via offset index:", read_line_at("example.txt", 1))
+
 # -----------------------------------------------------------
 # 4) CSV write/read (rows as tuples) - original style
 # -----------------------------------------------------------
@@ -120,6 +275,87 @@ top = sorted(data, key=lambda x: x["score"], reverse=True)[:3]
 print("Top players:", top)
 
 
+# -----------------------------------------------------------
+# 5b) Columns instead of rows: typed arrays + validity mask
+# -----------------------------------------------------------
+def _guess_type(value: str) -> str:
+    for kind, conv in (("int", int), ("float", float)):
+        try:
+            conv(value)
+            return kind
+        except ValueError:
+            pass
+    return "str"
+
+
+def _parse_column(raw, kind, widen=False):
+    """Convert a column of strings in one go; returns (values, valid).
+
+    With widen=True an "int" column that holds a value like "2.5" is
+    read as "float" instead of marking that value bad.
+    """
+    if kind == "str":
+        return list(raw), None
+    conv, typecode = (int, "q") if kind == "int" else (float, "d")
+    try:
+        # fast path: map() + array() do the whole column without a Python loop
+        return array(typecode, map(conv, raw)), bytearray(b"\x01") * len(raw)
+    except (ValueError, OverflowError):
+        pass
+    if widen and kind == "int" and any(_guess_type(v) == "float" for v in raw):
+        return _parse_column(raw, "float")
+    # slow path (only when some value is bad): mark bad cells instead of raising
+    values, valid = array(typecode), bytearray()
+    for v in raw:
+        try:
+            values.append(conv(v))
+            valid.append(1)
+        except (ValueError, OverflowError):
+            values.append(0)
+            valid.append(0)
+    return values, valid
+
+
+def read_scores_columns(path: Path, types=None):
+    """Read a CSV into columns: {"name": [...], "score": array('q', ...)}.
+
+    `types` maps a column name to "int", "float" or "str"; columns not
+    listed are guessed from their first non-blank value, and a guessed
+    "int" column becomes "float" if a later value only parses as a float.
+    Returns (columns, valid) where valid[name] is a bytearray with 1 for
+    good cells and 0 for blank or bad cells (numeric columns only).
+    """
+    with Path(path).open("r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # zip(*rows) turns a list of rows into a list of columns
+        raw_columns = list(itertools.zip_longest(*reader, fillvalue=""))
+    if not raw_columns:
+        raw_columns = [() for _ in header]
+    types = dict(types or {})
+    columns, valid = {}, {}
+    for name, raw in zip(header, raw_columns):
+        first = next((v for v in raw if v.strip()), "")  # skip blank cells
+        kind = types.get(name) or _guess_type(first)
+        columns[name], mask = _parse_column(raw, kind, widen=name not in types)
+        if mask is not None:
+            valid[name] = mask
+    return columns, valid
+
+
+def top_k_column(columns, valid, column, k=3):
+    """Return row indices of the k largest valid values in a numeric column."""
+    values = columns[column]
+    good_rows = itertools.compress(range(len(values)), valid[column])
+    return heapq.nlargest(k, good_rows, key=values.__getitem__)
+
+
+cols, ok = read_scores_columns("scores_dict.csv")
+print("\nColumns:", cols)
+best = top_k_column(cols, ok, "score", k=3)
+print("Top players (columnar):", [(cols["name"][i], cols["score"][i]) for i in best])
+
+
 # -----------------------------------------------------------
 # 6) JSON read/write (very handy to persist Python objects)
 # -----------------------------------------------------------
@@ -129,15 +365,60 @@ def write_json(path: Path, obj):
     print(f"Wrote JSON to {path}")
 
 
-def read_json(path: Path):
-    with Path(path).open("r", encoding="utf-8") as f:
-        return json.load(f)
+def read_json(path: Path, cache=False):
+    """Load a JSON file.
+
+    With cache=True a compact binary (pickle) copy is kept next to it as
+    <name>.cache, stamped with the JSON file's mtime and size. While the
+    JSON is unchanged, later loads read the fast binary copy instead of
+    parsing the text again. Only cache files you trust: loading a pickle
+    can run code.
+    """
+    path = Path(path)
+    if not cache:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache_path = path.with_name(path.name + ".cache")
+    try:
+        with cache_path.open("rb") as f:
+            if pickle.load(f) == stamp:  # read only the small stamp first
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # no cache yet, or an unreadable one: fall back to the JSON
+    with path.open("r", encoding="utf-8") as f:
+        obj = json.load(f)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with tmp.open("wb") as f:
+            pickle.dump(stamp, f, protocol=5)
+            pickle.dump(obj, f, protocol=5)
+        os.replace(tmp, cache_path)  # readers never see a half-written cache
+    except OSError:
+        tmp.unlink(missing_ok=True)  # the cache is optional: still return obj
+    return obj
 
 
 prefs = {"theme": "dark", "recent_files": ["example.txt", "scores.csv"]}
 write_json("prefs.json", prefs)
 print("Read JSON:", read_json("prefs.json"))
 
+# Load time: parsing JSON text vs the cached binary copy (~1 MB document).
+# The files go in a temporary folder that is removed afterwards.
+big = [{"id": i, "name": f"user{i}", "tags": ["a", "b"]} for i in range(20000)]
+with tempfile.TemporaryDirectory() as tmp_dir:
+    big_path = Path(tmp_dir) / "big.json"
+    write_json(big_path, big)
+    read_json(big_path, cache=True)  # first call creates big.json.cache
+    t0 = time.perf_counter()
+    read_json(big_path)
+    t1 = time.perf_counter()
+    cached = read_json(big_path, cache=True)
+    t2 = time.perf_counter()
+assert cached == big
+print(f"json parse: {(t1 - t0) * 1000:.1f} ms, cached: {(t2 - t1) * 1000:.1f} ms")
+
 
 # -----------------------------------------------------------
 # 7) Safe handling: missing files, exceptions
@@ -157,27 +438,63 @@ _ = safe_read("no_such_file.txt")
 # -----------------------------------------------------------
 # 8) Useful real-world tiny tasks (helpers + small challenges)
 # -----------------------------------------------------------
-def csv_to_json(csv_path: Path, json_path: Path):
+def _coerce_digits(r):
+    # try to coerce numeric strings to ints when possible
+    return {
+        k: int(v) if isinstance(v, str) and v.isdigit() else v for k, v in r.items()
+    }
+
+
+def csv_to_json(csv_path: Path, json_path: Path, lines=False):
+    """Convert CSV to a JSON array (or JSON Lines with lines=True).
+
+    Rows are read, converted and written one at a time, so memory use
+    stays flat no matter how big the CSV is. The JSON goes to a temporary
+    file first and only replaces json_path once everything succeeded.
+    """
+    json_path = Path(json_path)
+    tmp = json_path.with_name(json_path.name + ".tmp")
     try:
-        rows = read_scores_dict(csv_path)
-        # try to coerce numeric strings to ints when possible
-        for r in rows:
-            for k, v in r.items():
-                if isinstance(v, str) and v.isdigit():
-                    r[k] = int(v)
-        write_json(json_path, rows)
+        with Path(csv_path).open("r", newline="", encoding="utf-8") as f:
+            rows = map(_coerce_digits, csv.DictReader(f))
+            with tmp.open("w", encoding="utf-8") as out:
+                if lines:
+                    for r in rows:
+                        out.write(json.dumps(r, ensure_ascii=False) + "\n")
+                else:
+                    out.write("[")
+                    for i, r in enumerate(rows):
+                        out.write(",\n  " if i else "\n  ")
+                        out.write(json.dumps(r, ensure_ascii=False))
+                    out.write("\n]\n")
+        os.replace(tmp, json_path)
+        print(f"Wrote JSON to {json_path}")
     except FileNotFoundError:
         print(f"CSV {csv_path} not found; skipping conversion.")
+    finally:
+        tmp.unlink(missing_ok=True)  # only left over if something failed
+
+
+def iter_scores_dict(path: Path):
+    """Yield CSV rows as dicts one at a time (never holds the whole file)."""
+    with Path(path).open("r", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def _with_int_score(r):
+    try:
+        r["score"] = int(r.get("score", 0))
+    except ValueError:
+        r["score"] = 0
+    return r
 
 
 def top_k_from_csv(csv_path: Path, k=3):
-    rows = read_scores_dict(csv_path)
-    for r in rows:
-        try:
-            r["score"] = int(r.get("score", 0))
-        except ValueError:
-            r["score"] = 0
-    return sorted(rows, key=lambda x: x["score"], reverse=True)[:k]
+    # heapq.nlargest keeps only k rows in a small heap while streaming,
+    # so memory stays O(k) instead of loading and sorting every row.
+    # Same result (and tie order) as sorted(..., reverse=True)[:k].
+    rows = map(_with_int_score, iter_scores_dict(csv_path))
+    return heapq.nlargest(k, rows, key=lambda x: x["score"])
 
 
 # Interactive small utilities
@@ -192,18 +509,217 @@ if input("\nShow top-3 from scores_dict.csv? (y/N): ").strip().lower() == "y":
 # -----------------------------------------------------------
 # 9) File system utilities: list files, find largest file
 # -----------------------------------------------------------
+def _list_folder(folder):
+    """Return ([(path, size), ...], [subfolder, ...]) for one folder.
+
+    Each DirEntry already carries the info gathered while listing the
+    folder, so we avoid a separate stat() call per file on most systems.
+    Errors are handled per entry: a file that vanishes mid-scan is skipped
+    without losing its siblings. An unreadable folder gives ([], []).
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append((entry.path, entry.stat().st_size))
+                except OSError:
+                    continue  # vanished or unreadable entry: skip only this one
+    except OSError:
+        pass  # unreadable or vanished folder: keep whatever was listed
+    return files, subdirs
+
+
+def iter_file_sizes(folder, recursive=True):
+    """Yield (path, size) for every file under folder using os.scandir."""
+    stack = [os.fspath(folder)]
+    while stack:  # an explicit stack instead of recursion: no depth limit
+        files, subdirs = _list_folder(stack.pop())
+        yield from files
+        if recursive:
+            stack += subdirs
+
+
+def _summarize(files, top_n):
+    """Fold (path, size) pairs into (total, top-N largest, size per extension)."""
+    total = 0
+    largest = []  # min-heap of (size, path), never more than top_n items
+    by_ext = {}
+    for path, size in files:
+        total += size
+        ext = os.path.splitext(path)[1].lower() or "(none)"
+        by_ext[ext] = by_ext.get(ext, 0) + size
+        if len(largest) < top_n:
+            heapq.heappush(largest, (size, path))
+        elif largest and size > largest[0][0]:  # empty when top_n <= 0
+            heapq.heapreplace(largest, (size, path))
+    return total, largest, by_ext
+
+
+def scan_folder(folder: Path, top_n=3, workers=4):
+    """Scan folder recursively and answer three questions in one pass.
+
+    Returns {"total": bytes, "largest": [(size, path), ...],
+    "by_ext": {".txt": bytes, ...}}. Each top-level subfolder is scanned
+    in its own thread; scandir waits on the disk, so threads overlap well.
+    """
+    folder = Path(folder)
+    if not folder.is_dir():
+        return None
+    here, subdirs = _list_folder(folder)  # one listing of the top folder
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = [_summarize(here, top_n)]
+        parts += pool.map(lambda d: _summarize(iter_file_sizes(d), top_n), subdirs)
+
+    # merge the partial answers
+    total = sum(p[0] for p in parts)
+    largest = heapq.nlargest(top_n, (item for p in parts for item in p[1]))
+    by_ext = {}
+    for _, _, part_ext in parts:
+        for ext, size in part_ext.items():
+            by_ext[ext] = by_ext.get(ext, 0) + size
+    return {"total": total, "largest": largest, "by_ext": by_ext}
+
+
 def find_largest_file(folder: Path):
+    """Return (path, size) of the largest file directly in folder, or None."""
     folder = Path(folder)
-    if not folder.exists() or not folder.is_dir():
+    if not folder.is_dir():
         return None
-    files = [p for p in folder.iterdir() if p.is_file()]
-    if not files:
+    files = iter_file_sizes(folder, recursive=False)
+    best = max(files, key=lambda ps: ps[1], default=None)
+    if best is None:
         return None
-    return max(files, key=lambda p: p.stat().st_size)
+    return Path(best[0]), best[1]
 
 
 largest = find_largest_file(".")
 if largest:
-    print(
-        f"\nLargest file in current directory: {largest} ({largest.stat().st_size} bytes)"
-    )
+    path, size = largest
+    print(f"\nLargest file in current directory: {path} ({size} bytes)")
+
+summary = scan_folder(".", top_n=3)
+if summary:
+    print("Total size (recursive):", summary["total"], "bytes")
+    print("Top 3 largest:", summary["largest"])
+    print("Bytes per extension:", summary["by_ext"])
+
+
+# -----------------------------------------------------------
+# 10) Growing data: an append-only JSON Lines record store
+# -----------------------------------------------------------
+class JsonlStore:
+    """Keep records in a JSON Lines file: one JSON object per line.
+
+    append() only adds one line at the end of the file, so it costs the
+    same no matter how many records exist (write_json would rewrite them
+    all). The byte offset of every `index_every`-th record is remembered,
+    so get(n) seeks close to record n instead of reading from the top.
+    """
+
+    def __init__(self, path, index_every=100):
+        self.path = Path(path)
+        self.index_every = index_every
+        self._lock = threading.Lock()  # appends wait while compacting
+        self.path.touch(exist_ok=True)
+        self._build_index()
+
+    def _build_index(self):
+        self._offsets = array("q")  # offsets of records 0, N, 2N, ...
+        self.count = 0
+        pos = 0
+        ln = b"\n"
+        with self.path.open("rb") as f:
+            for ln in f:
+                if ln.strip():  # blank lines (e.g. from hand edits) are no record
+                    if self.count % self.index_every == 0:
+                        self._offsets.append(pos)
+                    self.count += 1
+                pos += len(ln)
+        self._end = pos
+        # A file saved by an editor may lack the final newline; the next
+        # append must add it, or two records would share one line.
+        self._needs_newline = not ln.endswith(b"\n")
+
+    @staticmethod
+    def _records(f):
+        """The non-blank lines of f from its current position."""
+        return (ln for ln in f if ln.strip())
+
+    @staticmethod
+    def _encode(record) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def append(self, record):
+        data = self._encode(record)
+        with self._lock:
+            with self.path.open("ab") as f:
+                if self._needs_newline:
+                    f.write(b"\n")
+                    self._end += 1  # the new record starts after it
+                    self._needs_newline = False
+                f.write(data)
+            if self.count % self.index_every == 0:
+                self._offsets.append(self._end)
+            self._end += len(data)
+            self.count += 1
+
+    def get(self, n):
+        """Return record number n (0-based)."""
+        if not 0 <= n < self.count:
+            raise IndexError(f"record {n} out of range (0..{self.count - 1})")
+        with self._lock, self.path.open("rb") as f:
+            f.seek(self._offsets[n // self.index_every])
+            # skip to the wanted record
+            skipped = itertools.islice(self._records(f), n % self.index_every, None)
+            return json.loads(next(skipped))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with self.path.open("rb") as f:
+            for ln in self._records(f):
+                yield json.loads(ln)
+
+    def query(self, where=None, **equals):
+        """Stream records that match, e.g. query(name="Bob") or
+        query(lambda r: r["score"] > 80). Nothing is loaded up front."""
+        for r in self:
+            if all(r.get(k) == v for k, v in equals.items()):
+                if where is None or where(r):
+                    yield r
+
+    def compact(self, keep, background=False):
+        """Rewrite the file with only the records where keep(record) is True.
+
+        The new file is written next to the old one and swapped in with
+        os.replace, so a crash never leaves a half-written store. With
+        background=True the work runs in a thread, which is returned.
+        """
+        if background:
+            t = threading.Thread(target=self.compact, args=(keep,))
+            t.start()
+            return t
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with self._lock:
+            with tmp.open("wb") as out:
+                for r in self:
+                    if keep(r):
+                        out.write(self._encode(r))
+            os.replace(tmp, self.path)
+            self._build_index()
+
+
+Path("scores.jsonl").unlink(missing_ok=True)  # fresh store for the demo
+store = JsonlStore("scores.jsonl", index_every=2)
+for name, score in [("Alice", 90), ("Bob", 75), ("Cathy", 88), ("Dan", 60)]:
+    store.append({"name": name, "score": score})
+print("\nRecords in store:", len(store))
+print("Record #2:", store.get(2))
+print("Scores >= 80:", list(store.query(lambda r: r["score"] >= 80)))
+store.compact(keep=lambda r: r["score"] >= 70, background=True).join()
+print("After compaction:", list(store))